@@ -3,7 +3,6 @@
 """API server for plan_and_execute.py"""
 
 import json
-import os
 import datetime
 from typing import Any, Dict, List, Optional
 
@@ -22,7 +21,8 @@ from workflows import (
     update_workflow_name as update_workflow_name_func,
     load_workflow,
 )
-from workflow_logger import log_workflow_execution
+import workflow_logger
+from workflow_logger import alog_workflow_execution
 from view_workflow_logs import list_log_files, parse_log_file, filter_logs
 
 # Load environment variables
@@ -299,7 +299,7 @@ async def execute_workflow(filename: str, request: WorkflowExecuteRequest) -> Di
         workflow_name = workflow_data.get("metadata", {}).get("name", filename)
 
         # Log the workflow execution
-        log_workflow_execution(
+        await alog_workflow_execution(
             workflow_name=workflow_name, start_time=start_time, end_time=end_time, result=json_formatted
         )
 
@@ -312,7 +312,7 @@ async def execute_workflow(filename: str, request: WorkflowExecuteRequest) -> Di
         end_time = datetime.datetime.now()
 
         # Log the failed execution
-        log_workflow_execution(
+        await alog_workflow_execution(
             workflow_name=(
                 workflow_data.get("metadata", {}).get("name", filename) if "workflow_data" in locals() else filename
             ),
@@ -394,6 +394,27 @@ async def update_workflow_name(filename: str, request: UpdateWorkflowNameRequest
         raise HTTPException(status_code=500, detail=error_message) from e
 
 
+def get_latest_workflow_log_entry(workflow_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the latest execution log entry for a workflow.
+
+    Args:
+        workflow_name: The name of the workflow, as recorded in its logs.
+
+    Returns:
+        The parsed latest log entry for the workflow, or None if it has no logs.
+    """
+    # Get all log files and keep the ones for this workflow, reading the logger's directory at call time
+    all_log_files = list_log_files(workflow_logger.LOGS_DIR)
+    workflow_log_files = filter_logs(all_log_files, workflow_name=workflow_name)
+
+    if not workflow_log_files:
+        return None
+
+    # Only the latest log is needed (first in the list since they're sorted newest first)
+    return parse_log_file(workflow_log_files[0])
+
+
 @api.get("/workflows/{filename}/logs/latest", response_model=Dict[str, Any])
 async def get_latest_workflow_log(filename: str) -> Dict[str, Any]:
     """
@@ -415,19 +436,12 @@ async def get_latest_workflow_log(filename: str) -> Dict[str, Any]:
     try:
         workflow_name = workflow_data.get("metadata", {}).get("name", workflow_id)
 
-        logs_dir = os.path.join(os.path.dirname(__file__), "logs")
-
-        # Get all log files
-        all_log_files = list_log_files(logs_dir)
-
-        # Filter logs for this workflow
-        workflow_logs = filter_logs(all_log_files, workflow_name=workflow_name)
+        # Get the latest log for this workflow
+        latest_log = get_latest_workflow_log_entry(workflow_name)
 
-        if not workflow_logs:
+        if latest_log is None:
             return {"found": False, "message": "No execution logs found for this workflow"}
 
-        # Get the latest log (first in the list since they're sorted newest first)
-        latest_log = parse_log_file(workflow_logs[0])
         return {"found": True, "log": latest_log}
     except Exception as e:
         raise HTTPException(
@@ -0,0 +1,121 @@
+"""Shared fixtures for the test suite"""
+
+# pylint: disable=redefined-outer-name
+
+import copy
+import tempfile
+from functools import partialmethod
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from tinydb import TinyDB
+from tinydb.storages import MemoryStorage
+from tinydb.table import Document
+
+from api_server import api
+from db import Database
+from plan_and_execute import PlanAndExecuteAgent
+
+# Result returned by the mock agent's run coroutine unless a test overrides it
+_EMPTY_AGENT_RESULT = {
+    "final_result": None,
+    "goal_assessment_result": None,
+    "goal_assessment_feedback": None,
+    "error": None,
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def skip_dotenv():
+    """Stop agents created during the session from loading the developer's .env file"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("plan_and_execute.load_dotenv", lambda: None)
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tinydb():
+    """Share one in-memory workflows database between the tests and the API for the whole session"""
+    # Nothing is parsed from or written to disk, and the table starts empty every session
+    shared_db = TinyDB(storage=MemoryStorage)
+
+    # Every Database() created by the API reuses the shared handle instead of opening db/workflows.json
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(Database, "__init__", partialmethod(Database.__init__, db=shared_db))
+        yield Database()
+
+
+@pytest.fixture(scope="session")
+def seed_workflows(tinydb):
+    """Provide a function that seeds workflows into the shared table until the end of the session
+
+    Each call inserts copies of the given workflows in a single batch write and returns
+    their original content as Documents keyed by workflow ID, carrying the rows' doc_ids.
+    """
+    seeded_doc_ids = []
+
+    def seed(*workflows):
+        # Copy the workflows, since documents in the in-memory table share nested dicts with what was inserted
+        rows = [copy.deepcopy(workflow) for workflow in workflows]
+        doc_ids = tinydb.workflows_table.insert_multiple(rows)
+        seeded_doc_ids.extend(doc_ids)
+        return {row["id"]: Document(copy.deepcopy(row), doc_id=doc_id) for doc_id, row in zip(doc_ids, rows)}
+
+    yield seed
+
+    # Clean up the database after the session, by doc_id so the table isn't scanned
+    tinydb.workflows_table.remove(doc_ids=seeded_doc_ids)
+
+
+@pytest.fixture(autouse=True)
+def logs_dir(monkeypatch):
+    """Point the workflow logger, and so the API that reads its logs, at a temporary logs directory for each test"""
+    with tempfile.TemporaryDirectory() as temp_logs_dir:
+        monkeypatch.setattr("workflow_logger.LOGS_DIR", temp_logs_dir)
+        yield temp_logs_dir
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Create a test client whose app startup and shutdown run once per session"""
+    with TestClient(api) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def mock_agent_class():
+    """Replace the agent class used by the API with a mock for the duration of a test"""
+    with patch("api_server.PlanAndExecuteAgent") as agent_class:
+        yield agent_class
+
+
+@pytest.fixture
+def mock_agent(mock_agent_class):
+    """Provide the agent instance the API creates, whose run coroutine returns an empty result unless overridden"""
+    # The API only calls run, so skip MagicMock's magic-method setup
+    agent = Mock(spec_set=["run"])
+    agent.run = AsyncMock(return_value=_EMPTY_AGENT_RESULT)
+    mock_agent_class.return_value = agent
+    return agent
+
+
+@pytest.fixture(scope="session")
+def agent():
+    """Share one agent across the agent tests, since building its clients and workflow graph is expensive"""
+    # Tests patch the agent's methods and attributes with context managers, which undo the patch afterwards
+    return PlanAndExecuteAgent()
+
+
+@pytest.fixture(scope="session")
+def replay_astream():
+    """Provide a factory for stand-ins of the agent's app.astream that replay a fixed sequence of events"""
+
+    def make_astream(events):
+        async def astream(*_, **__):
+            for event in events:
+                yield event
+
+        return astream
+
+    return make_astream
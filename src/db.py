@@ -1,12 +1,21 @@
 import os
+from typing import Optional
+
 from tinydb import TinyDB, Query
 
 
 class Database:
-    def __init__(self):
-        """Initializes the TinyDB database for workflows."""
-        db_path = os.path.join(os.path.dirname(__file__), "db", "workflows.json")
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)  # Ensure 'db' directory exists
-        self.db = TinyDB(db_path)
+    def __init__(self, db: Optional[TinyDB] = None):
+        """
+        Initializes the TinyDB database for workflows.
+
+        Args:
+            db: An open TinyDB instance to use instead of the on-disk workflows database
+        """
+        if db is None:
+            db_path = os.path.join(os.path.dirname(__file__), "db", "workflows.json")
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)  # Ensure 'db' directory exists
+            db = TinyDB(db_path)
+        self.db = db
         self.workflows_table = self.db.table("workflows")
         self.workflow_query = Query()
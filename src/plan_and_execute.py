@@ -20,7 +20,7 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
 from langgraph.prebuilt import create_react_agent
 from PIL import Image as PILImage
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from tavily import TavilyClient
 from typing_extensions import TypedDict
 
@@ -32,18 +32,24 @@ MODEL_NAME = "gpt-4o"
 class Plan(BaseModel):
     """Plan to follow in future"""
 
+    model_config = ConfigDict(frozen=True)
+
     steps: List[str] = Field(description="different steps to follow, should be in sorted order")
 
 
 class Response(BaseModel):
     """Response to user."""
 
+    model_config = ConfigDict(frozen=True)
+
     response: str
 
 
 class Act(BaseModel):
     """Action to perform."""
 
+    model_config = ConfigDict(frozen=True)
+
     action: Union[Response, Plan] = Field(
         description="Action to perform. If you want to respond to user, use Response. "
         "If you need to further use tools to get the answer, use Plan."
@@ -53,6 +59,8 @@ class Act(BaseModel):
 class GoalAssessment(BaseModel):
     """Assessment of whether the goal has been satisfied"""
 
+    model_config = ConfigDict(frozen=True)
+
     is_satisfied: bool = Field(description="Whether the goal has been satisfied")
     final_response: str = Field(
         description="Final response to the user if goal is satisfied, or explanation of what's missing if not"
@@ -36,6 +36,8 @@ def main():
         os.path.join(script_dir, "test_plan_and_execute.py"),
         os.path.join(script_dir, "test_integration.py"),
         os.path.join(script_dir, "test_api_server.py"),
+        os.path.join(script_dir, "test_view_workflow_logs.py"),
+        os.path.join(script_dir, "test_workflow_logger.py"),
     ]
 
     print("Running backend tests for the Plan and Execute agent...")
@@ -0,0 +1,81 @@
+"""Tests for the workflow log viewer"""
+
+import json
+import os
+
+import pytest
+
+from view_workflow_logs import list_log_files, parse_log_file
+
+
+def test_parse_log_file_rereads_modified_file(tmp_path):
+    """Test that a cached log is parsed again once the file's modification time changes"""
+    log_path = str(tmp_path / "20240101_120000_Test_Workflow.json")
+    with open(log_path, "w", encoding="utf-8") as f:
+        json.dump({"workflow_name": "Test Workflow", "result": "Result 1"}, f)
+
+    assert parse_log_file(log_path)["result"] == "Result 1"
+
+    # Rewrite the log and move its mtime forward, so the change is seen even within the filesystem's timestamp resolution
+    with open(log_path, "w", encoding="utf-8") as f:
+        json.dump({"workflow_name": "Test Workflow", "result": "Result 2"}, f)
+    mtime = os.path.getmtime(log_path) + 10
+    os.utime(log_path, (mtime, mtime))
+
+    assert parse_log_file(log_path)["result"] == "Result 2"
+
+
+def test_parse_log_file_rereads_rewrite_with_same_mtime(tmp_path):
+    """Test that a log rewritten with a different size is parsed again even if its mtime is unchanged"""
+    log_path = str(tmp_path / "20240101_120000_Test_Workflow.json")
+    with open(log_path, "w", encoding="utf-8") as f:
+        json.dump({"workflow_name": "Test Workflow", "result": "Result 1"}, f)
+    mtime_ns = os.stat(log_path).st_mtime_ns
+
+    assert parse_log_file(log_path)["result"] == "Result 1"
+
+    # Rewrite the log, then restore its mtime as a filesystem with coarse timestamps would leave it
+    with open(log_path, "w", encoding="utf-8") as f:
+        json.dump({"workflow_name": "Test Workflow", "result": "Longer result 2"}, f)
+    os.utime(log_path, ns=(mtime_ns, mtime_ns))
+
+    assert parse_log_file(log_path)["result"] == "Longer result 2"
+
+
+def test_parse_log_file_missing_file(tmp_path):
+    """Test that parsing a log file that doesn't exist raises FileNotFoundError"""
+    with pytest.raises(FileNotFoundError):
+        parse_log_file(str(tmp_path / "missing.json"))
+
+
+def test_list_log_files_missing_dir(tmp_path):
+    """Test that listing a logs directory that doesn't exist returns no files"""
+    assert list_log_files(str(tmp_path / "missing")) == []
+
+
+def test_list_log_files_skips_non_json_files(tmp_path):
+    """Test that files without a .json extension are not listed"""
+    (tmp_path / "20240101_120000_Test_Workflow.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "20240101_130000_Test_Workflow.txt").write_text("{}", encoding="utf-8")
+
+    assert list_log_files(str(tmp_path)) == [str(tmp_path / "20240101_120000_Test_Workflow.json")]
+
+
+def test_list_log_files_skips_directories(tmp_path):
+    """Test that a directory whose name ends in .json is not listed"""
+    (tmp_path / "20240101_120000_Test_Workflow.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "20240101_130000_Archive.json").mkdir()
+
+    assert list_log_files(str(tmp_path)) == [str(tmp_path / "20240101_120000_Test_Workflow.json")]
+
+
+def test_list_log_files_newest_first(tmp_path):
+    """Test that log files are listed newest first by their timestamp prefix"""
+    for filename in ("20240101_120000_B.json", "20240102_090000_A.json", "20240101_180000_C.json"):
+        (tmp_path / filename).write_text("{}", encoding="utf-8")
+
+    assert list_log_files(str(tmp_path)) == [
+        str(tmp_path / "20240102_090000_A.json"),
+        str(tmp_path / "20240101_180000_C.json"),
+        str(tmp_path / "20240101_120000_B.json"),
+    ]
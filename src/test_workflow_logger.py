@@ -0,0 +1,30 @@
+"""Tests for the workflow execution logger"""
+
+import datetime
+import json
+import os
+import shutil
+
+from workflow_logger import log_workflow_execution
+
+# Fixed start and end times for the logged executions
+_START_TIME = datetime.datetime(2024, 1, 1, 12, 0, 0)
+_END_TIME = datetime.datetime(2024, 1, 1, 12, 0, 5)
+
+
+def test_log_workflow_execution_recreates_removed_logs_dir(logs_dir):
+    """Test that a log is still written after the logs directory is removed between writes"""
+    first_log_path = log_workflow_execution("First Workflow", _START_TIME, _END_TIME, result="first")
+    assert os.path.exists(first_log_path)
+
+    # Remove the directory the first write created or found
+    shutil.rmtree(logs_dir)
+
+    second_log_path = log_workflow_execution("Second Workflow", _START_TIME, _END_TIME, result="second")
+    with open(second_log_path, "r", encoding="utf-8") as f:
+        log_entry = json.load(f)
+
+    assert os.path.dirname(second_log_path) == logs_dir
+    assert log_entry["workflow_name"] == "Second Workflow"
+    assert log_entry["result"] == "second"
+    assert log_entry["duration_seconds"] == 5.0
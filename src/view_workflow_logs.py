@@ -6,8 +6,11 @@ import os
 import json
 import argparse
 import datetime
+import functools
 from typing import Dict, List, Optional
 
+from workflow_logger import LOGS_DIR
+
 
 def list_log_files(logs_dir: str) -> List[str]:
     """
@@ -19,25 +22,27 @@ def list_log_files(logs_dir: str) -> List[str]:
     Returns:
         List of log file paths
     """
-    if not os.path.exists(logs_dir):
+    # scandir reports the file type with each entry, so no extra stat is needed
+    try:
+        with os.scandir(logs_dir) as entries:
+            log_files = [entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+    except FileNotFoundError:
         return []
 
-    log_files = []
-    for filename in os.listdir(logs_dir):
-        if filename.endswith(".json"):
-            log_files.append(os.path.join(logs_dir, filename))
-
     # Sort by timestamp (newest first)
     log_files.sort(reverse=True)
     return log_files
 
 
-def parse_log_file(log_path: str) -> Dict:
+@functools.lru_cache(maxsize=1024)
+def _parse_log_file_cached(log_path: str, mtime_ns: int, size: int) -> Dict:
     """
-    Parse a log file and return its contents.
+    Parse a log file, caching the result until the file is modified.
 
     Args:
         log_path: Path to the log file
+        mtime_ns: Modification time of the log file in nanoseconds, used only as part of the cache key
+        size: Size of the log file in bytes, used only as part of the cache key
 
     Returns:
         Dictionary containing the log data
@@ -46,6 +51,24 @@ def parse_log_file(log_path: str) -> Dict:
         return json.load(f)
 
 
+def parse_log_file(log_path: str) -> Dict:
+    """
+    Parse a log file and return its contents.
+
+    The parsed data is cached, so the same dictionary is returned for repeated
+    calls and should not be modified.
+
+    Args:
+        log_path: Path to the log file
+
+    Returns:
+        Dictionary containing the log data
+    """
+    # Key on size as well, since a log rewritten within the filesystem's mtime resolution keeps its mtime
+    stat = os.stat(log_path)
+    return _parse_log_file_cached(log_path, stat.st_mtime_ns, stat.st_size)
+
+
 def format_log_entry(log_data: Dict, verbose: bool = False) -> str:
     """
     Format a log entry for display.
@@ -154,14 +177,8 @@ def main():
     parser.add_argument("--latest", action="store_true", help="Show only the latest log")
     args = parser.parse_args()
 
-    # Get the logs directory
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-
-    # Create logs directory if it doesn't exist
-    os.makedirs(logs_dir, exist_ok=True)
-
-    # Get all log files
-    all_log_files = list_log_files(logs_dir)
+    # Get all log files; a missing logs directory just means there are none
+    all_log_files = list_log_files(LOGS_DIR)
 
     if not all_log_files:
         print("No log files found.")
@@ -2,11 +2,32 @@
 # -*- coding: utf-8 -*-
 """Logging functionality for workflow executions."""
 
+import asyncio
 import os
 import json
 import datetime
+import functools
+import re
 from typing import Any, Optional
 
+# Directory the workflow execution logs are written to
+LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+
+# Characters replaced with an underscore in log filenames; \W matches anything str.isalnum rejects except "_"
+_UNSAFE_NAME_CHARS = re.compile(r"\W")
+
+
+@functools.lru_cache(maxsize=None)
+def _create_logs_dir(logs_dir: str) -> None:
+    """Create a logs directory the first time it is written to, skipping the check on later writes."""
+    os.makedirs(logs_dir, exist_ok=True)
+
+
+def _write_log_file(log_path: str, log_json: str) -> None:
+    """Write an encoded log entry to a file."""
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write(log_json)
+
 
 def log_workflow_execution(
     workflow_name: str,
@@ -31,8 +52,7 @@ def log_workflow_execution(
         Path to the log file that was written
     """
     # Create logs directory if it doesn't exist
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-    os.makedirs(logs_dir, exist_ok=True)
+    _create_logs_dir(LOGS_DIR)
 
     # Format the log entry
     log_entry = {
@@ -49,12 +69,51 @@ def log_workflow_execution(
 
     # Create a filename with timestamp
     timestamp = start_time.strftime("%Y%m%d_%H%M%S")
-    safe_workflow_name = "".join(c if c.isalnum() else "_" for c in workflow_name)
+    safe_workflow_name = _UNSAFE_NAME_CHARS.sub("_", workflow_name)
     log_filename = f"{timestamp}_{safe_workflow_name}.json"
-    log_path = os.path.join(logs_dir, log_filename)
+    log_path = os.path.join(LOGS_DIR, log_filename)
 
-    # Write the log entry to the file
-    with open(log_path, "w", encoding="utf-8") as f:
-        json.dump(log_entry, f, indent=2, ensure_ascii=False)
+    # Encode the whole entry before writing, since json.dump issues a write per encoded fragment
+    log_json = json.dumps(log_entry, indent=2, ensure_ascii=False)
+    try:
+        _write_log_file(log_path, log_json)
+    except FileNotFoundError:
+        # The logs directory was removed after it was created, so create it again and retry once
+        _create_logs_dir.cache_clear()
+        _create_logs_dir(LOGS_DIR)
+        _write_log_file(log_path, log_json)
 
     return log_path
+
+
+async def alog_workflow_execution(
+    workflow_name: str,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    result: Any,
+    success: bool = True,
+    error: Optional[str] = None,
+) -> str:
+    """
+    Log a workflow execution to a file from a worker thread, so the event loop isn't blocked.
+
+    Args:
+        workflow_name: Name of the workflow that was executed
+        start_time: When the workflow execution started
+        end_time: When the workflow execution ended
+        result: The final result value of the workflow execution
+        success: Whether the execution was successful
+        error: Error message if the execution failed
+
+    Returns:
+        Path to the log file that was written
+    """
+    return await asyncio.to_thread(
+        log_workflow_execution,
+        workflow_name=workflow_name,
+        start_time=start_time,
+        end_time=end_time,
+        result=result,
+        success=success,
+        error=error,
+    )